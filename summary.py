@@ -1,38 +1,60 @@
 """
 summary.py  –  Generate a concise effort-variance summary and (optionally) e-mail it.
 
-Preference order
-----------------
+Summarisers (run concurrently, first successful answer wins)
+-----------------------------------------------------------
 1️⃣  OpenAI GPT-4o-mini  ........  needs  OPENAI_API_KEY
-2️⃣  Hugging Face BART  .........  needs  HF_TOKEN      (used if GPT key absent *or* GPT call fails)
+2️⃣  Hugging Face BART  .........  needs  HF_TOKEN      (the other engine still answers if one fails)
 
 If neither key is present the script exits with code 1.
+Days with ≤ LLM_MIN_BULLETS (default 3) red items skip the LLM and use a local template.
 
 Optional mail:
-  EMAIL_USER, EMAIL_PASS, EMAIL_TO   →  sent via smtp.gmail.com:465
+  EMAIL_USER, EMAIL_PASS, EMAIL_TO   →  sent via smtp.gmail.com:587 (STARTTLS)
   (skips SMTP gracefully if any of the three is missing)
+  --daemon QUEUE_DIR keeps one smtp.gmail.com:465 login open across many sends.
+
+CSV input is read as UTF-8; set CSV_ENCODING (e.g. cp1252) for exports saved in
+a Windows code page.
+
+Summaries are cached for 7 days under ~/.cache/pmo_summary (override with
+PMO_CACHE_DIR), keyed by the preferred engine's model + bullets; answers from the
+fallback engine are not cached. Pass --no-cache to bypass.
 
 Usage:
-  python summary.py <csv_or_xlsx_file>
+  python summary.py [--no-cache] [--no-mail] [--dump-email PATH] <csv_or_xlsx_file>
+  python summary.py [--no-cache] [--no-mail] --batch <file> [<file> ...]
+  python summary.py --batch <file> [<file> ...] --use-openai-batch-api
+  python summary.py [--no-cache] [--parallel-scan] --daemon <queue_dir>   (needs mail creds)
 """
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import codecs
+import contextlib
 import csv
+import functools
+import hashlib
 import logging
 import os
-import re
 import smtplib
+import ssl
 import sys
 import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.message import EmailMessage
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, Tuple
 
-import pandas as pd
-import requests
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:   # pandas, pyarrow, openpyxl, httpx and openai are imported where they are used
+    import pandas as pd
+    import pyarrow as pa
+
 # ────────────────────────────────  env & logging  ──────────────────────────────
 load_dotenv()
 
@@ -44,105 +66,516 @@ SMTP_PASS = os.getenv("EMAIL_PASS", "")
 SMTP_TO   = [a.strip() for a in os.getenv("EMAIL_TO", "").split(",") if a.strip()]
 
 GPT_MODEL   = os.getenv("GPT_MODEL", "gpt-4o-mini")
+GPT_TIMEOUT = float(os.getenv("GPT_TIMEOUT", "30"))   # seconds, per request
 HF_MODEL_ID = "facebook/bart-large-cnn"
 HF_API_URL  = f"https://api-inference.huggingface.co/models/{HF_MODEL_ID}"
 HF_HEADERS  = {"Authorization": f"Bearer {HF_TOKEN}"} if HF_TOKEN else {}
 
-EMAIL_TMP = Path("SUMMARY_EMAIL.txt")
+LLM_MIN_BULLETS = int(os.getenv("LLM_MIN_BULLETS", "3"))   # ≤ this many reds → no LLM call
+ALL_GREEN       = "All tasks green today – great job! 🎉"
+
+HF_RETRIES      = 3
+HF_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+SMTP_HOST = "smtp.gmail.com"
+
+TRACKER_SUFFIXES = {".csv", ".xlsx"}
+DAEMON_POLL_SECS = int(os.getenv("DAEMON_POLL_SECS", "60"))
+
+CSV_ENCODING = os.getenv("CSV_ENCODING", "utf-8")   # Windows "CSV" (not "CSV UTF-8") exports: cp1252
+
+CACHE_DIR = Path(os.getenv("PMO_CACHE_DIR", "~/.cache/pmo_summary")).expanduser()
+CACHE_TTL = 7 * 24 * 3600   # seconds
 
 LOG_LEVEL  = os.getenv("LOG_LEVEL", "INFO").upper()
-logging.basicConfig(level=LOG_LEVEL, format="%(levelname)s  %(message)s")
 
 # ────────────────────────────────  summariser  ────────────────────────────────
-def gpt_summarise(bullets: str) -> str:
-    """Summarise using OpenAI ChatCompletion (GPT-4o-mini)."""
-    import openai
-    logging.info("🔮  Trying OpenAI GPT (%s)", GPT_MODEL)
-    openai.api_key = OPENAI_API_KEY
+class SummariserError(RuntimeError):
+    """No summariser is configured, or every configured one failed."""
+
 
+def gpt_messages(bullets: str) -> List[dict]:
     prompt = (
         "Summarise the following project issues in ≤90 words of plain English, "
         "group similar items, end with an overall RAG if obvious.\n\n"
         f"Issues: {bullets}"
     )
+    return [{"role": "user", "content": prompt}]
+
 
-    response = openai.ChatCompletion.create(
+class LLMClients:
+    """
+    One keep-alive HTTP client per engine, created on first use and shared by every
+    summary made on the same event loop (e.g. all trackers of a --batch run).
+    """
+
+    def __init__(self) -> None:
+        self._gpt = None
+        self._hf  = None
+
+    def gpt(self):
+        if self._gpt is None:
+            import httpx
+            import openai
+            self._gpt = openai.AsyncOpenAI(
+                api_key=OPENAI_API_KEY,
+                timeout=httpx.Timeout(GPT_TIMEOUT, connect=5.0),
+                http_client=httpx.AsyncClient(
+                    http2=True, limits=httpx.Limits(max_keepalive_connections=5),
+                ),
+            )
+        return self._gpt
+
+    def hf(self):
+        if self._hf is None:
+            import httpx
+            transport = httpx.AsyncHTTPTransport(retries=HF_RETRIES)   # connect errors only
+            self._hf  = httpx.AsyncClient(transport=transport, timeout=60)
+        return self._hf
+
+    async def __aenter__(self) -> LLMClients:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._gpt is not None:
+            await self._gpt.close()
+        if self._hf is not None:
+            await self._hf.aclose()
+
+
+async def gpt_summarise(bullets: str, clients: LLMClients) -> str:
+    """Summarise using OpenAI Chat Completions (GPT-4o-mini)."""
+    logging.info("🔮  Trying OpenAI GPT (%s)", GPT_MODEL)
+    stream = await clients.gpt().chat.completions.create(
         model=GPT_MODEL,
-        messages=[{"role": "user", "content": prompt}],
+        messages=gpt_messages(bullets),
         temperature=0.3,
+        stream=True,
     )
-    return response.choices[0].message["content"].strip()
+    parts = [c.choices[0].delta.content or "" async for c in stream if c.choices]
+    return "".join(parts).strip()
 
 
-def hf_summarise(bullets: str) -> str:
+async def hf_summarise(bullets: str, clients: LLMClients) -> str:
     """Summarise using Hugging Face BART (free inference endpoint)."""
-    logging.info("🤖  Falling back to Hugging Face BART")
-    payload = {"inputs": bullets, "parameters": {"max_length": 90}}
+    import orjson
+    logging.info("🤖  Trying Hugging Face BART")
+    body    = orjson.dumps({"inputs": bullets, "parameters": {"max_length": 90}})
+    headers = {**HF_HEADERS, "Content-Type": "application/json"}
+    client  = clients.hf()
+    for attempt in range(HF_RETRIES + 1):
+        r = await client.post(HF_API_URL, headers=headers, content=body)
+        if r.status_code not in HF_RETRY_STATUS or attempt == HF_RETRIES:
+            break
+        await asyncio.sleep(0.5 * 2 ** attempt)   # cold-start 503s, rate limits
+    if r.status_code == 401:
+        raise RuntimeError("401 – invalid HF_TOKEN")
+    r.raise_for_status()
+    return orjson.loads(r.content)[0]["summary_text"]
+
+
+def template_summary(parts: List[str]) -> str:
+    """A handful of red items already is the summary – list them verbatim."""
+    return "Red items today:\n- " + "\n- ".join(parts) + "\nOverall RAG: Red."
+
+
+def _engines() -> List[tuple]:
+    """(summariser, model id) for every engine with a key – the preferred one first."""
+    return [
+        (fn, model)
+        for fn, key, model in ((gpt_summarise, OPENAI_API_KEY, GPT_MODEL), (hf_summarise, HF_TOKEN, HF_MODEL_ID))
+        if key
+    ]
+
+
+async def summarise(bullets: str, clients: LLMClients) -> Tuple[str, str]:
+    """
+    Run every configured engine concurrently and return (model id, summary) of
+    the first success; the slower call is cancelled. Raise SummariserError if no
+    engine is configured or all of them fail.
+    """
+    engines = _engines()
+    if not engines:
+        raise SummariserError("No OPENAI_API_KEY or HF_TOKEN supplied – cannot summarise.")
+
+    tasks   = [asyncio.create_task(fn(bullets, clients), name=model) for fn, model in engines]
+    pending = set(tasks)
     try:
-        r = requests.post(HF_API_URL, headers=HF_HEADERS, json=payload, timeout=60)
-        if r.status_code == 401:
-            sys.exit("ERROR 401 – invalid HF_TOKEN")
-        r.raise_for_status()
-        return r.json()[0]["summary_text"]
-    except requests.exceptions.RequestException as e:
-        sys.exit(f"ERROR: Hugging Face request failed → {e}")
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            answer = None
+            for task in (t for t in tasks if t in done):   # preferred engine wins a tie
+                if task.exception() is not None:
+                    logging.warning("⚠️  %s failed – %s", task.get_name(), task.exception())
+                elif answer is None:
+                    answer = task.get_name(), task.result()
+            if answer is not None:
+                return answer
+    finally:
+        for task in pending:
+            task.cancel()
+
+    raise SummariserError("every summariser failed – cannot summarise.")
+
+
+async def cached_summarise(bullets: str, clients: LLMClients, use_cache: bool = True) -> str:
+    """
+    summarise() behind an on-disk cache keyed by sha256(preferred model + bullets).
+    Only the preferred engine's answers are stored, so a BART fallback is never
+    served in place of GPT once GPT answers again.
+    """
+    engines = _engines()
+    if not use_cache or not engines:
+        return (await summarise(bullets, clients))[1]
+
+    preferred = engines[0][1]
+    key  = hashlib.sha256(f"{preferred}\0{bullets}".encode("utf-8")).hexdigest()
+    path = CACHE_DIR / f"{key}.txt"
+    try:
+        if time.time() - path.stat().st_mtime < CACHE_TTL:
+            logging.info("💾  Using cached summary %s", path.name[:12])
+            return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        pass
+
+    model, summary = await summarise(bullets, clients)
+    if model != preferred:
+        logging.info("💾  %s answered, not %s – summary not cached", model, preferred)
+        return summary
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_text(summary, encoding="utf-8")
+    except OSError as err:
+        logging.warning("⚠️  Could not write summary cache – %s", err)
+    return summary
+
 
+def needs_llm(bullets: List[str]) -> bool:
+    """False for all-green days and for ≤ LLM_MIN_BULLETS reds – those are formatted locally."""
+    return bullets != [ALL_GREEN] and len(bullets) > LLM_MIN_BULLETS
 
-def summarise(bullets: str) -> str:
+
+async def summarise_bullets(bullets: List[str], clients: LLMClients, use_cache: bool = True) -> str:
+    """
+    All-green days and short red lists need no summariser – the bullets already
+    are the message. Everything else goes through the cached LLM call.
+    """
+    if needs_llm(bullets):
+        return await cached_summarise("; ".join(bullets), clients, use_cache=use_cache)
+    if bullets == [ALL_GREEN]:
+        logging.info("🟢  No red items – skipping the summariser")
+        return ALL_GREEN
+    logging.info("📝  %d red item(s) – using the local template, no LLM call", len(bullets))
+    return template_summary(bullets)
+
+# ────────────────────────────────  helpers  ───────────────────────────────────
+TASK_COLUMNS           = ("Task_Name", "Task", "Work_Package")
+MAX_BULLETS            = 10
+CSV_CHUNK_ROWS         = 50_000
+CSV_BLOCK_BYTES        = 4 << 20   # pyarrow reader block (~50k rows of a typical tracker)
+PARALLEL_SCAN_MIN_ROWS = 500_000
+
+def _is_effort_column(name: str) -> bool:
+    """Case-insensitive "var…h" match, e.g. "Effort_Variance_hrs" – plain substring checks."""
+    low = name.lower()
+    i   = low.find("var")
+    return i >= 0 and "h" in low[i + 3:]
+
+
+def _wanted_column(name: str) -> bool:
+    """`usecols` filter – only the RAG, task-name and effort-variance columns are read."""
+    return name == "Status_RAG" or name in TASK_COLUMNS or _is_effort_column(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _calamine():
+    """CalamineWorkbook if python-calamine is installed, else None (warns once)."""
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        logging.warning("🐢  python-calamine not installed – falling back to openpyxl for XLSX")
+        return None
+    return CalamineWorkbook
+
+
+def _xlsx_rows(path: Path) -> Iterator[Sequence]:
+    """Yield sheet rows as value sequences – Rust calamine parser if available, else openpyxl."""
+    calamine = _calamine()
+    if calamine is not None:
+        yield from calamine.from_path(str(path)).get_sheet_by_index(0).iter_rows()
+        return
+
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from wb.worksheets[0].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _cell_str(value) -> str:
+    """Render a cell like the CSV export would – calamine hands back 12.0 for 12."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _stream_xlsx_reds(path: Path) -> pd.DataFrame:
+    """
+    Stream the first sheet row by row and keep only Red rows.
+    Stops as soon as MAX_BULLETS distinct tasks are collected, so the rest of the
+    workbook is never turned into Python objects.
     """
-    Try GPT first; if GPT key missing *or* any GPT error occurs, try Hugging Face.
-    Exit if both engines are unavailable.
+    import pandas as pd
+
+    it       = _xlsx_rows(path)
+    headers  = [_cell_str(h) for h in next(it, ())]
+    keep_idx = [i for i, h in enumerate(headers) if _wanted_column(h)]
+    columns  = [headers[i] for i in keep_idx]
+    if "Status_RAG" not in headers:
+        it.close()
+        return pd.DataFrame(columns=columns)
+
+    rag_idx  = headers.index("Status_RAG")
+    task_pos = [columns.index(c) for c in TASK_COLUMNS if c in columns]   # into kept tuples
+
+    width = len(headers)
+    seen, kept = set(), []
+    for row in it:
+        if len(row) < width:   # read-only openpyxl yields short rows when <dimension> is missing
+            row = (*row, *(None,) * (width - len(row)))
+        rag = row[rag_idx]
+        if not (isinstance(rag, str) and rag[:3].casefold() == "red"):
+            continue
+        r    = tuple(_cell_str(row[i]) for i in keep_idx)
+        task = next((r[i] for i in task_pos if r[i]), "(no name)").strip()
+        seen.add(" ".join(task.split()).lower())
+        kept.append(r)
+        if len(seen) == MAX_BULLETS:
+            break
+    it.close()
+    return pd.DataFrame.from_records(kept, columns=columns)
+
+
+def _red_mask(df: pd.DataFrame) -> pd.Series:
+    """Vectorised `Status_RAG` starts-with-"red" test (case-insensitive)."""
+    import pandas as pd
+
+    if "Status_RAG" not in df.columns:
+        return pd.Series(False, index=df.index)
+    return df["Status_RAG"].astype(str).str[:3].str.casefold() == "red"
+
+
+def _task_names(df: pd.DataFrame) -> pd.Series:
     """
-    if OPENAI_API_KEY:
+    First non-blank of Task_Name / Task / Work_Package per row, stripped;
+    "(no name)" where all are blank.
+    """
+    import pandas as pd
+
+    cols = [c for c in TASK_COLUMNS if c in df.columns]
+    if not cols:
+        return pd.Series("(no name)", index=df.index)
+    tasks = df[cols[-1]].astype(str)
+    for c in reversed(cols[:-1]):   # column-wise fallback – a row-wise bfill transposes
+        col   = df[c].astype(str)
+        tasks = col.where(col != "", tasks)
+    tasks = tasks.str.strip()
+    return tasks.mask(tasks == "", "(no name)")
+
+
+def _dedupe_key(tasks: pd.Series) -> pd.Series:
+    return tasks.str.split().str.join(" ").str.lower()
+
+
+@functools.lru_cache(maxsize=None)
+def _pyarrow_csv():
+    """pyarrow.csv if pyarrow is installed, else None (pandas' C parser is used)."""
+    try:
+        import pyarrow.csv as pacsv
+    except ImportError:
+        logging.debug("pyarrow not installed – reading CSV with the pandas C engine")
+        return None
+    return pacsv
+
+
+class CsvEncodingError(ValueError):
+    """The CSV does not decode with CSV_ENCODING."""
+
+
+@contextlib.contextmanager
+def _csv_decode_errors() -> Iterator[None]:
+    """
+    Re-raise a decode failure from anywhere in the file – the header sniff or
+    pandas (UnicodeDecodeError), pyarrow ("invalid UTF8" ArrowInvalid) – as
+    CsvEncodingError with the CSV_ENCODING hint.
+    """
+    try:
+        yield
+    except ValueError as err:   # UnicodeDecodeError and ArrowInvalid both subclass it
+        if isinstance(err, UnicodeDecodeError) or "UTF8" in str(err):
+            raise CsvEncodingError(
+                f"input is not {CSV_ENCODING} ({err}) – set CSV_ENCODING, e.g. cp1252."
+            ) from err
+        raise
+
+
+def _header_encoding() -> str:
+    """CSV_ENCODING, with UTF-8 widened to utf-8-sig so a BOM never sticks to the first header."""
+    return "utf-8-sig" if codecs.lookup(CSV_ENCODING).name == "utf-8" else CSV_ENCODING
+
+
+def _arrow_csv_options(path: Path) -> Optional[dict]:
+    """pyarrow read/parse/convert options for the wanted columns – None if there are none."""
+    import pyarrow as pa
+
+    pacsv = _pyarrow_csv()
+    with path.open(newline="", encoding=_header_encoding()) as f:
+        wanted = [c for c in next(csv.reader(f), []) if _wanted_column(c)]
+    if not wanted:
+        return None
+    return {
+        "read_options":    pacsv.ReadOptions(block_size=CSV_BLOCK_BYTES, encoding=CSV_ENCODING),
+        "parse_options":   pacsv.ParseOptions(newlines_in_values=True),   # multi-line notes
+        "convert_options": pacsv.ConvertOptions(
+            include_columns=wanted,
+            column_types={c: pa.string() for c in wanted},
+            strings_can_be_null=False,
+        ),
+    }
+
+
+def _csv_chunks(path: Path) -> Iterator[pd.DataFrame]:
+    """
+    Yield the wanted CSV columns as string DataFrames, CSV_CHUNK_ROWS-ish at a time.
+    Uses pyarrow's multithreaded streaming reader when available.
+    """
+    import pandas as pd
+
+    pacsv = _pyarrow_csv()
+    if pacsv is None:
         try:
-            return gpt_summarise(bullets)
-        except Exception as err:
-            logging.warning("⚠️  GPT call failed – %s", err)
+            chunks = pd.read_csv(
+                path, engine="c", usecols=_wanted_column, dtype=str, na_filter=False,
+                encoding=CSV_ENCODING, chunksize=CSV_CHUNK_ROWS,
+            )
+        except pd.errors.EmptyDataError:   # zero-byte export – nothing to report, as with pyarrow
+            return
+        with chunks:
+            yield from chunks
+        return
+
+    options = _arrow_csv_options(path)
+    if options is None:
+        return
+    with pacsv.open_csv(path, **options) as reader:
+        for batch in reader:
+            yield batch.to_pandas()
 
-    if HF_TOKEN:
-        return hf_summarise(bullets)
 
-    sys.exit("No OPENAI_API_KEY or HF_TOKEN supplied – cannot summarise.")
+def _find_reds(df: pd.DataFrame) -> pd.DataFrame:
+    """Red rows of `df`, de-duplicated on task name and capped at MAX_BULLETS."""
+    reds = df.loc[_red_mask(df)]
+    return reds.loc[~_dedupe_key(_task_names(reds)).duplicated()].head(MAX_BULLETS)
 
-# ────────────────────────────────  helpers  ───────────────────────────────────
-def load_rows(path: Path) -> List[dict]:
+
+def _arrow_reds(table: pa.Table) -> pa.Table:
+    """Red rows of an Arrow table, found with pyarrow.compute kernels (no GIL held)."""
+    import pyarrow.compute as pc
+
+    rag = pc.utf8_lower(pc.utf8_slice_codeunits(table["Status_RAG"], 0, 3))
+    return table.filter(pc.equal(rag, "red"))
+
+
+def _scan_parallel(path: Path) -> pd.DataFrame:
+    """
+    Read the whole CSV as an Arrow table and filter it one slice per CPU on a
+    thread pool. The compute kernels release the GIL, so the slices run on all
+    cores; only the Red rows are ever turned into pandas objects.
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    options = _arrow_csv_options(path)
+    if options is None:
+        return pd.DataFrame()
+    table = _pyarrow_csv().read_csv(path, **options)
+    if "Status_RAG" not in table.column_names:
+        return pd.DataFrame(columns=table.column_names)
+
+    if table.num_rows > PARALLEL_SCAN_MIN_ROWS:
+        workers = os.cpu_count() or 1
+        step    = -(-table.num_rows // workers)
+        shards  = [table.slice(i, step) for i in range(0, table.num_rows, step)]
+        logging.info("🧵  Scanning %d rows in %d shards", table.num_rows, len(shards))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            reds = pa.concat_tables(pool.map(_arrow_reds, shards))   # file order kept
+    else:
+        reds = _arrow_reds(table)
+    return _find_reds(reds.to_pandas())
+
+
+def _read_csv_reds(path: Path, parallel_scan: bool = False) -> pd.DataFrame:
+    """
+    Read the CSV in chunks and keep only Red rows.
+    Stops once MAX_BULLETS distinct tasks are collected, so a front-loaded file is
+    never parsed to the end. With `parallel_scan` (needs pyarrow) the whole file is
+    read instead and filtered across all cores.
+    """
+    import pandas as pd
+
+    if parallel_scan:
+        if _pyarrow_csv() is not None:
+            with _csv_decode_errors():
+                return _scan_parallel(path)
+        logging.warning("🐢  --parallel-scan needs pyarrow – using the sequential reader")
+
+    seen, kept = set(), []
+    chunks = _csv_chunks(path)
+    with _csv_decode_errors():
+        for chunk in chunks:
+            reds = chunk.loc[_red_mask(chunk)]
+            kept.append(reds)
+            seen.update(_dedupe_key(_task_names(reds)))
+            if len(seen) >= MAX_BULLETS:
+                break
+    chunks.close()
+    return pd.concat(kept) if kept else pd.DataFrame()
+
+
+def load_rows(path: Path, parallel_scan: bool = False) -> pd.DataFrame:
+    """
+    Load the Red rows of the tracker as strings (only the columns the summary uses).
+    Both readers stop early once enough distinct Red tasks are found; `parallel_scan`
+    (CSV only) trades that early exit for a multi-threaded filter of the whole file.
+    """
     if path.suffix.lower() == ".csv":
-        return list(csv.DictReader(path.open()))
-    return pd.read_excel(path).to_dict(orient="records")
+        return _read_csv_reds(path, parallel_scan)
+    return _stream_xlsx_reds(path)
 
 
-def build_bullets(rows: List[dict]) -> List[str]:
+def build_bullets(df: pd.DataFrame) -> List[str]:
     """Return list of unique Red-status bullets (max 10)."""
-    reds = [r for r in rows if str(r.get("Status_RAG", "")).lower().startswith("red")]
-    if not reds:
-        return ["All tasks green today – great job! 🎉"]
-
-    effort_key = next((k for k in rows[0] if re.search(r"var.*h", k, re.I)), None)
-
-    seen, bullets = set(), []
-    for r in reds:
-        task = (
-            r.get("Task_Name")
-            or r.get("Task")
-            or r.get("Work_Package")
-            or "(no name)"
-        ).strip()
-        norm = re.sub(r"\s+", " ", task).lower()
-        if norm in seen:
-            continue  # de-dupe
-        seen.add(norm)
-
-        hrs = r.get(effort_key, "?") if effort_key else "?"
-        bullets.append(f"{task}: {hrs}h over")
-        if len(bullets) == 10:
-            break
+    import pandas as pd
+
+    reds = df.loc[_red_mask(df)]
+    if reds.empty:
+        return [ALL_GREEN]
+
+    effort_key = next((k for k in df.columns if _is_effort_column(k)), None)
+    tasks = _task_names(reds)
+    hrs   = reds[effort_key].astype(str) if effort_key else pd.Series("?", index=reds.index)
 
-    return bullets
+    keep  = ~_dedupe_key(tasks).duplicated()   # de-dupe
+    return (tasks[keep] + ": " + hrs[keep] + "h over").head(MAX_BULLETS).tolist()
 
 
 def craft_email(summary: str) -> EmailMessage:
     body = textwrap.dedent(
-        f"""\
+        """\
         Hello Team,
 
         Below is today’s effort-variance snapshot generated automatically.
@@ -156,7 +589,7 @@ def craft_email(summary: str) -> EmailMessage:
         Thanks,
         Hafiza Maham
         """
-    )
+    ).format(summary=summary)   # format after dedent – multi-line summaries break it
     msg = EmailMessage()
     msg["Subject"] = "Daily PMO Effort-Variance Snapshot"
     msg["From"]    = SMTP_USER or "pmo-bot@example.com"
@@ -165,40 +598,267 @@ def craft_email(summary: str) -> EmailMessage:
     return msg
 
 
-def send_mail(msg: EmailMessage) -> None:
-    if not (SMTP_USER and SMTP_PASS and (SMTP_TO or SMTP_USER)):
+def _mail_configured() -> bool:
+    return bool(SMTP_USER and SMTP_PASS and (SMTP_TO or SMTP_USER))
+
+
+def open_smtp() -> smtplib.SMTP_SSL:
+    """Log in once over implicit TLS – used by --daemon to reuse the connection."""
+    smtp = smtplib.SMTP_SSL(SMTP_HOST, 465, context=ssl.create_default_context())
+    smtp.login(SMTP_USER, SMTP_PASS)
+    return smtp
+
+
+def send_mail(msg: EmailMessage, smtp: smtplib.SMTP | None = None) -> None:
+    """
+    Send via an already logged-in `smtp` connection if given, otherwise open a
+    one-shot STARTTLS session on port 587.
+    """
+    if not _mail_configured():
         logging.warning("📭  Mail creds missing – skipping SMTP send.")
         return
     logging.info("📧  Sending e-mail to %s", ", ".join(SMTP_TO) or SMTP_USER)
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as s:
+    if smtp is not None:
+        smtp.send_message(msg)
+        return
+    with smtplib.SMTP(SMTP_HOST, 587) as s:
+        s.starttls(context=ssl.create_default_context())
         s.login(SMTP_USER, SMTP_PASS)
         s.send_message(msg)
 
 # ────────────────────────────────  main  ──────────────────────────────────────
-def main() -> None:
-    if len(sys.argv) < 2:
-        sys.exit("Usage: python summary.py <csv_or_xlsx_file>")
+def run(path: Path, use_cache: bool = True, parallel_scan: bool = False) -> str:
+    """
+    Library entry point – load one tracker and return its effort-variance summary.
+    Nothing is printed or mailed; raises SummariserError if no summary could be made.
+    """
+    logging.info("📂  Loading data from %s", path)
+    rows    = load_rows(path, parallel_scan)
+    bullets = build_bullets(rows)
 
-    file_in = Path(sys.argv[1])
-    if not file_in.exists():
-        sys.exit(f"Input file not found: {file_in}")
+    async def _summarise() -> str:
+        async with LLMClients() as clients:
+            return await summarise_bullets(bullets, clients, use_cache=use_cache)
 
-    logging.info("📂  Loading data from %s", file_in)
-    rows    = load_rows(file_in)
-    bullets = build_bullets(rows)
-    summary = summarise("; ".join(bullets))
+    return asyncio.run(_summarise())
 
-    EMAIL_TMP.write_text(summary, encoding="utf-8")
-    print("\n" + textwrap.fill(summary, 100) + "\n")
 
-    send_mail(craft_email(summary))
+def run_batch(
+    paths: List[Path], use_cache: bool = True, parallel_scan: bool = False,
+) -> List[str | SummariserError]:
+    """
+    Summarise several trackers, with all of their LLM calls in flight at once.
+    A tracker whose summarisers all fail gets its SummariserError in place of a
+    summary; the other trackers' results are kept.
+    """
+    async def _gather(bullet_sets: List[List[str]]) -> List[str | SummariserError]:
+        async with LLMClients() as clients:   # one connection per engine for all trackers
+            results = await asyncio.gather(
+                *(summarise_bullets(b, clients, use_cache=use_cache) for b in bullet_sets),
+                return_exceptions=True,
+            )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, SummariserError):
+                raise result
+        return results
+
+    bullet_sets = []
+    for path in paths:
+        logging.info("📂  Loading data from %s", path)
+        bullet_sets.append(build_bullets(load_rows(path, parallel_scan)))
+    return asyncio.run(_gather(bullet_sets))
+
+
+def submit_openai_batch(
+    paths: List[Path], parallel_scan: bool = False,
+) -> Tuple[Optional[str], List[Tuple[Path, str]]]:
+    """
+    Queue one GPT request per tracker that needs the LLM on the OpenAI Batch API
+    (half price, results within 24 h). Return the batch id – None if no tracker
+    needs the LLM – and (path, summary) for the all-green and short trackers,
+    which are formatted locally right away, as summarise_bullets() would.
+    """
+    import openai
+    import orjson
+
+    if not OPENAI_API_KEY:
+        raise SummariserError("--use-openai-batch-api needs OPENAI_API_KEY.")
+
+    lines, local = [], []
+    for i, path in enumerate(paths):
+        bullets = build_bullets(load_rows(path, parallel_scan))
+        if not needs_llm(bullets):
+            local.append((path, ALL_GREEN if bullets == [ALL_GREEN] else template_summary(bullets)))
+            continue
+        bullets = "; ".join(bullets)
+        lines.append(orjson.dumps({
+            "custom_id": f"{i}:{path}",   # must be unique, even if a path is repeated
+            "method":    "POST",
+            "url":       "/v1/chat/completions",
+            "body":      {"model": GPT_MODEL, "messages": gpt_messages(bullets), "temperature": 0.3},
+        }))
+
+    if not lines:
+        logging.info("🟢  No tracker needs the LLM – nothing to submit")
+        return None, local
+
+    client = openai.OpenAI(api_key=OPENAI_API_KEY)
+    upload = client.files.create(file=("pmo_batch.jsonl", b"\n".join(lines)), purpose="batch")
+    batch  = client.batches.create(
+        input_file_id=upload.id, endpoint="/v1/chat/completions", completion_window="24h",
+    )
+    logging.info("📦  Submitted %d trackers as OpenAI batch %s", len(lines), batch.id)
+    return batch.id, local
 
+
+def _quit_smtp(smtp: smtplib.SMTP | None) -> None:
+    if smtp is None:
+        return
     try:
-        EMAIL_TMP.unlink()
-        logging.debug("🗑️  Deleted %s", EMAIL_TMP)
-    except FileNotFoundError:
+        smtp.quit()
+    except (smtplib.SMTPException, OSError):
         pass
 
+
+def _daemon_send(msg: EmailMessage, smtp: smtplib.SMTP | None) -> smtplib.SMTP:
+    """Send over the daemon's connection, reconnecting once if it was dropped; return it."""
+    for attempt in range(2):
+        if smtp is None:
+            smtp = open_smtp()
+        try:
+            send_mail(msg, smtp)
+            return smtp
+        except smtplib.SMTPServerDisconnected:
+            if attempt:
+                raise
+            logging.info("🔌  SMTP connection dropped – reconnecting")
+            smtp = None
+    return smtp
+
+
+def run_daemon(queue: Path, use_cache: bool = True, parallel_scan: bool = False) -> None:
+    """
+    Watch `queue` for tracker files, summarise and mail each one, then move it to
+    `queue/done`. Unreadable trackers go to `queue/failed`; summariser or SMTP
+    errors leave the file queued for the next poll. One SMTP_SSL login is reused
+    for every message and re-opened only when the server drops it.
+    Needs mail creds – a tracker only moves to `done` once its summary is sent.
+    """
+    done, failed = queue / "done", queue / "failed"
+    for d in (done, failed):
+        d.mkdir(parents=True, exist_ok=True)
+    smtp = None
+    logging.info("👀  Watching %s (poll every %ss)", queue, DAEMON_POLL_SECS)
+    try:
+        while True:
+            for path in sorted(p for p in queue.iterdir() if p.suffix.lower() in TRACKER_SUFFIXES):
+                try:
+                    msg = craft_email(run(path, use_cache, parallel_scan))
+                except SummariserError as err:
+                    logging.error("❌  %s – %s; retrying next poll", path.name, err)
+                    continue
+                except Exception as err:
+                    logging.error("❌  %s failed – %s", path.name, err)
+                    path.replace(failed / path.name)
+                    continue
+                try:
+                    smtp = _daemon_send(msg, smtp)
+                except (smtplib.SMTPException, OSError) as err:
+                    logging.error("📭  Mail for %s failed – %s; retrying next poll", path.name, err)
+                    _quit_smtp(smtp)
+                    smtp = None
+                    continue
+                path.replace(done / path.name)
+            time.sleep(DAEMON_POLL_SECS)
+    except KeyboardInterrupt:
+        logging.info("👋  Stopping daemon.")
+    finally:
+        _quit_smtp(smtp)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate the daily effort-variance summary.")
+    parser.add_argument("input", type=Path, nargs="?", help="tracker export (.csv or .xlsx)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached summaries")
+    parser.add_argument("--no-mail", action="store_true", help="print the summary but do not e-mail it")
+    parser.add_argument(
+        "--parallel-scan", action="store_true",
+        help=f"read whole CSVs with pyarrow and filter them on all cores (above {PARALLEL_SCAN_MIN_ROWS:,} rows)",
+    )
+    parser.add_argument(
+        "--dump-email", type=Path, metavar="PATH", help="also write the summary text to PATH",
+    )
+    parser.add_argument(
+        "--daemon", type=Path, metavar="QUEUE_DIR",
+        help="keep running, mail a summary for every tracker dropped into QUEUE_DIR",
+    )
+    parser.add_argument(
+        "--batch", type=Path, nargs="+", metavar="FILE",
+        help="summarise several trackers concurrently into one report",
+    )
+    parser.add_argument(
+        "--use-openai-batch-api", action="store_true",
+        help="with --batch: submit trackers that need the LLM to the OpenAI Batch API and print "
+             "the batch id; all-green and short trackers are summarised locally and reported now",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=LOG_LEVEL, format="%(levelname)s  %(message)s")
+
+    if args.daemon:
+        if args.input or args.batch or args.no_mail or args.dump_email or args.use_openai_batch_api:
+            parser.error(
+                "--daemon mails every queued tracker; it cannot be combined with an input file, "
+                "--batch, --no-mail, --dump-email or --use-openai-batch-api"
+            )
+        if not _mail_configured():
+            sys.exit("ERROR: --daemon needs EMAIL_USER and EMAIL_PASS – summaries would be discarded.")
+        run_daemon(args.daemon, use_cache=not args.no_cache, parallel_scan=args.parallel_scan)
+        return
+    if args.use_openai_batch_api and not args.batch:
+        parser.error("--use-openai-batch-api requires --batch")
+    if (args.input is None) == (args.batch is None):
+        parser.error("give either one input file or --batch FILE [FILE ...]")
+
+    files_in = args.batch or [args.input]
+    for file_in in files_in:
+        if not file_in.exists():
+            sys.exit(f"Input file not found: {file_in}")
+
+    try:
+        if args.use_openai_batch_api:
+            batch_id, local = submit_openai_batch(files_in, parallel_scan=args.parallel_scan)
+            if batch_id:
+                print(batch_id)
+            if not local:
+                sys.exit(0)
+            summary = "\n\n".join(f"{p}:\n{s}" for p, s in local)   # the rest arrive with the batch
+        elif args.batch:
+            summaries = run_batch(files_in, use_cache=not args.no_cache, parallel_scan=args.parallel_scan)
+            failures  = [s for s in summaries if isinstance(s, SummariserError)]
+            if len(failures) == len(summaries):
+                raise failures[0]
+            for p, s in zip(files_in, summaries):
+                if isinstance(s, SummariserError):
+                    logging.warning("⚠️  %s – %s", p.name, s)
+            summary = "\n\n".join(
+                f"{p.stem}:\n{'(summary unavailable)' if isinstance(s, SummariserError) else s}"
+                for p, s in zip(files_in, summaries)
+            )
+        else:
+            summary = run(args.input, use_cache=not args.no_cache, parallel_scan=args.parallel_scan)
+    except (SummariserError, CsvEncodingError) as err:
+        sys.exit(f"ERROR: {err}")
+
+    if args.dump_email:
+        args.dump_email.write_text(summary, encoding="utf-8")
+    print("\n" + "\n".join(textwrap.fill(line, 100) for line in summary.splitlines()) + "\n")
+
+    if args.no_mail:
+        logging.info("📭  --no-mail given – skipping SMTP send.")
+    else:
+        send_mail(craft_email(summary))
+
     logging.info("✅  Done.")
     sys.exit(0)
 
@@ -0,0 +1,192 @@
+import asyncio
+import os
+import re
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import summary
+
+
+def test_csv_multiline_cells_across_pyarrow_blocks(tmp_path: Path, monkeypatch) -> None:
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(summary, "CSV_BLOCK_BYTES", 4096)   # force many block boundaries
+
+    rows  = ["Task_Name,Notes,Effort_Variance_hrs,Status_RAG"]
+    rows += [f'T{i},"first line\nsecond line",1,Green' for i in range(2000)]
+    rows += ['Z,"blocked on\nvendor",3,Red']
+    path  = tmp_path / "tracker.csv"
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    assert summary.build_bullets(summary.load_rows(path)) == ["Z: 3h over"]
+
+
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+def test_csv_encoding_option(tmp_path: Path, monkeypatch, use_pyarrow: bool) -> None:
+    if use_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(summary, "_pyarrow_csv", lambda: None)
+    monkeypatch.setattr(summary, "CSV_ENCODING", "cp1252")
+
+    path = tmp_path / "tracker.csv"
+    path.write_text("Task_Name,Effort_Variance_hrs,Status_RAG\nRévision café,4,Red\n", encoding="cp1252")
+
+    assert summary.build_bullets(summary.load_rows(path)) == ["Révision café: 4h over"]
+
+
+@pytest.mark.parametrize("reader", ["pyarrow", "pyarrow-parallel", "pandas"])
+def test_csv_decode_error_past_first_buffer(tmp_path: Path, monkeypatch, reader: str) -> None:
+    if reader == "pandas":
+        monkeypatch.setattr(summary, "_pyarrow_csv", lambda: None)
+        monkeypatch.setattr(summary, "CSV_CHUNK_ROWS", 500)
+    else:
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(summary, "CSV_BLOCK_BYTES", 4096)
+
+    rows  = ["Task_Name,Effort_Variance_hrs,Status_RAG"]
+    rows += [f"T{i},1,Green" for i in range(5000)]   # well past the 8 KB header sniff
+    rows += ["Révision café,4,Red"]
+    path  = tmp_path / "tracker.csv"
+    path.write_text("\n".join(rows) + "\n", encoding="cp1252")
+
+    with pytest.raises(summary.CsvEncodingError, match="set CSV_ENCODING"):
+        summary.load_rows(path, parallel_scan=reader == "pyarrow-parallel")
+
+
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+def test_empty_csv_is_all_green(tmp_path: Path, monkeypatch, use_pyarrow: bool) -> None:
+    if use_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(summary, "_pyarrow_csv", lambda: None)
+
+    path = tmp_path / "tracker.csv"
+    path.write_bytes(b"")
+
+    assert summary.build_bullets(summary.load_rows(path)) == [summary.ALL_GREEN]
+
+
+def test_xlsx_short_rows_without_dimension(tmp_path: Path, monkeypatch) -> None:
+    openpyxl = pytest.importorskip("openpyxl")
+    monkeypatch.setattr(summary, "_calamine", lambda: None)
+
+    wb = openpyxl.Workbook()
+    wb.active.append(["Task_Name", "Effort_Variance_hrs", "Status_RAG"])
+    wb.active.append(["A"])
+    wb.active.append(["B", 5, "Red"])
+    saved = tmp_path / "saved.xlsx"
+    wb.save(saved)
+
+    path = tmp_path / "tracker.xlsx"   # same workbook minus <dimension>, as some exporters write it
+    with zipfile.ZipFile(saved) as zin, zipfile.ZipFile(path, "w") as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename.startswith("xl/worksheets/"):
+                data = re.sub(rb"<dimension[^>]*/>", b"", data)
+            zout.writestr(item, data)
+
+    assert summary.build_bullets(summary.load_rows(path)) == ["B: 5h over"]
+
+
+@pytest.fixture
+def engines(tmp_path: Path, monkeypatch):
+    """Both engines configured, with a fresh cache dir; tests swap in the engine stubs."""
+    monkeypatch.setattr(summary, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(summary, "HF_TOKEN", "hf-test")
+    monkeypatch.setattr(summary, "CACHE_DIR", tmp_path / "cache")
+    calls = []
+
+    def stub(name: str, result=None, delay: float = 0.0, cancelled: list | None = None):
+        async def engine(bullets: str, clients) -> str:
+            calls.append(name)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                if cancelled is not None:
+                    cancelled.append(name)
+                raise
+            if isinstance(result, Exception):
+                raise result
+            return result
+        monkeypatch.setattr(summary, f"{name}_summarise", engine)
+
+    stub.calls = calls
+    return stub
+
+
+def test_summarise_first_success_wins_and_loser_is_cancelled(engines) -> None:
+    cancelled = []
+    engines("gpt", "slow gpt", delay=10, cancelled=cancelled)
+    engines("hf", "fast bart")
+
+    async def go():
+        answer = await summary.summarise("a; b", summary.LLMClients())
+        await asyncio.sleep(0)   # let the cancellation land
+        return answer
+
+    assert asyncio.run(go()) == (summary.HF_MODEL_ID, "fast bart")
+    assert cancelled == ["gpt"]
+
+
+def test_summarise_waits_for_the_other_engine_when_one_fails(engines) -> None:
+    engines("gpt", RuntimeError("quota"))
+    engines("hf", "bart", delay=0.01)
+
+    assert asyncio.run(summary.summarise("a", summary.LLMClients())) == (summary.HF_MODEL_ID, "bart")
+
+
+def test_summarise_raises_when_every_engine_fails(engines, monkeypatch) -> None:
+    engines("gpt", RuntimeError("quota"))
+    engines("hf", RuntimeError("503"))
+    with pytest.raises(summary.SummariserError, match="every summariser failed"):
+        asyncio.run(summary.summarise("a", summary.LLMClients()))
+
+    monkeypatch.setattr(summary, "OPENAI_API_KEY", None)
+    monkeypatch.setattr(summary, "HF_TOKEN", None)
+    with pytest.raises(summary.SummariserError, match="No OPENAI_API_KEY or HF_TOKEN"):
+        asyncio.run(summary.summarise("a", summary.LLMClients()))
+
+
+def test_cached_summarise_reuses_until_ttl(engines) -> None:
+    engines("gpt", "gpt text")
+    engines("hf", "bart", delay=10)
+    run = lambda: asyncio.run(summary.cached_summarise("a; b", summary.LLMClients()))
+
+    assert run() == "gpt text"
+    assert run() == "gpt text"
+    assert engines.calls.count("gpt") == 1
+
+    (entry,) = summary.CACHE_DIR.iterdir()
+    stale = time.time() - summary.CACHE_TTL - 1
+    os.utime(entry, (stale, stale))
+    assert run() == "gpt text"
+    assert engines.calls.count("gpt") == 2
+
+
+def test_cached_summarise_does_not_store_fallback_answers(engines) -> None:
+    engines("gpt", RuntimeError("quota"))
+    engines("hf", "bart")
+
+    assert asyncio.run(summary.cached_summarise("a; b", summary.LLMClients())) == "bart"
+    assert not summary.CACHE_DIR.exists()
+
+
+@pytest.mark.parametrize("n_reds, uses_llm", [(0, False), (3, False), (4, True)])
+def test_summarise_bullets_template_threshold(engines, monkeypatch, n_reds: int, uses_llm: bool) -> None:
+    monkeypatch.setattr(summary, "LLM_MIN_BULLETS", 3)
+    engines("gpt", "gpt text")
+    engines("hf", "bart", delay=10)
+    bullets = [f"T{i}: 1h over" for i in range(n_reds)] or [summary.ALL_GREEN]
+
+    result = asyncio.run(summary.summarise_bullets(bullets, summary.LLMClients(), use_cache=False))
+
+    if uses_llm:
+        assert result == "gpt text"
+    elif n_reds:
+        assert result == summary.template_summary(bullets)
+    else:
+        assert result == summary.ALL_GREEN
+    assert bool(engines.calls) == uses_llm